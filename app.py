@@ -5,7 +5,8 @@ app.py
 A lightweight web application providing an interactive interface to the
 Work and Income scraper and diagnostic tool.  This server uses only
 Python's built‑in ``http.server`` module for maximum compatibility
-without external dependencies.
+without external dependencies.  Each connection is handled on its own
+thread so slow requests (OCR, large documents) do not block others.
 
 Available pages include:
 
@@ -17,6 +18,8 @@ Available pages include:
   links to view individual items.  Includes a manual update trigger.
 * ``/documents/html/...`` – View a downloaded HTML page as plain text.
 * ``/documents/pdf_text/...`` – View extracted text from a PDF.
+* ``/documents/raw/html/...`` and ``/documents/raw/pdf_text/...`` – The
+  same files streamed unmodified as plain text.
 * ``/upload`` – Form for uploading a scanned letter or PDF; POST
   requests run OCR and analyse the letter.
 
@@ -30,14 +33,26 @@ from __future__ import annotations
 import cgi
 import html
 import json
+import logging
+import mimetypes
+import multiprocessing
 import os
+import shutil
+import string
+import sys
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.parse import parse_qs, urlparse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
 
 import diagnostic
 import letter_analysis
+from crawl_utils import iter_files
+from improved_work_and_income_scraper import request_scrape, run_periodic_scrape
 from scraper import WorkAndIncomeScraper
 from ocr_utils import extract_text
 
@@ -45,37 +60,188 @@ from ocr_utils import extract_text
 # initialisation.
 SCRAPER = WorkAndIncomeScraper()
 
+# Stylesheets and other assets shipped alongside this module
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# Static assets change only with a new release, so browsers may keep them
+STATIC_CACHE_CONTROL = "public, max-age=86400, immutable"
+
 # Ensure uploads directory exists
 UPLOAD_DIR = os.path.join(SCRAPER.output_dir, "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Resolved roots that served files must stay within
+_HTML_ROOT = os.path.realpath(SCRAPER.html_dir)
+_TEXT_ROOT = os.path.realpath(SCRAPER.text_dir)
+_STATIC_ROOT = os.path.realpath(STATIC_DIR)
 
-class WebHandler(BaseHTTPRequestHandler):
-    """Handle HTTP requests for the Work and Income helper site."""
+# Interval in days between automatic site updates while the server runs
+UPDATE_INTERVAL_DAYS = 30
 
-    def _render_page(self, title: str, body: str) -> None:
-        """Helper to send a complete HTML page with basic styling."""
-        content = f"""<!DOCTYPE html>
+
+# Text extraction (pdftotext/Tesseract) is CPU bound, so it runs in worker
+# processes rather than on the request thread.  "spawn" avoids forking a
+# process that is already running server threads.
+OCR_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+# Seconds to wait for text extraction before giving up on an upload
+OCR_TIMEOUT = 120
+_OCR_POOL = ProcessPoolExecutor(max_workers=OCR_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+_OCR_POOL_LOCK = threading.Lock()
+
+
+def _extract_text_in_pool(path: str) -> str:
+    """Run :func:`ocr_utils.extract_text` in the OCR process pool.
+
+    Raises:
+        concurrent.futures.TimeoutError: Extraction took longer than
+            ``OCR_TIMEOUT`` seconds.  A job still waiting in the queue is
+            cancelled; one already running is bounded by
+            ``ocr_utils.SUBPROCESS_TIMEOUT`` per tool invocation.
+        BrokenProcessPool: A worker died; the pool is replaced so later
+            uploads can still be processed.
+    """
+    pool = _OCR_POOL
+    try:
+        # One page at a time per upload: the pool already runs uploads in parallel
+        future = pool.submit(extract_text, path, 1)
+        return future.result(timeout=OCR_TIMEOUT)
+    except FuturesTimeoutError:
+        # Nobody will read the result, so don't let a queued job occupy a worker
+        future.cancel()
+        raise
+    except BrokenProcessPool:
+        _replace_ocr_pool(pool)
+        raise
+
+
+def _replace_ocr_pool(pool: ProcessPoolExecutor) -> None:
+    """Replace ``pool`` with a fresh OCR pool unless another thread already did."""
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is pool:
+            _OCR_POOL = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+
+
+# Upper bound on form/query fields parsed per request; the survey has eight
+MAX_FORM_FIELDS = 32
+
+# Chunk size used when copying uploaded files to disk
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _save_upload(src, save_path: str) -> None:
+    """Write an uploaded file object to ``save_path`` without buffering it.
+
+    ``cgi.FieldStorage`` keeps small uploads in memory and spills larger
+    ones to a temporary file.  Spilled files are copied fd‑to‑fd with
+    ``os.sendfile`` on Linux; anything else is streamed in fixed‑size
+    chunks so the whole upload is never held in memory at once.
+    """
+    with open(save_path, "wb") as dst:
+        try:
+            in_fd = src.fileno()
+        except (AttributeError, OSError):
+            in_fd = None
+        if in_fd is not None and sys.platform.startswith("linux"):
+            size = os.fstat(in_fd).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), in_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        else:
+            src.seek(0)
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+
+# Document listings keyed by directory:
+# root -> (mtime, cached_at, sorted relative paths, rendered <ul> markup)
+_LISTING_CACHE: dict[str, tuple[float, float, list[str], str]] = {}
+_LISTING_LOCK = threading.Lock()
+# A directory's mtime only changes when its direct entries change, so
+# listings of nested trees are also refreshed after this many seconds
+LISTING_TTL = 60.0
+
+
+def _listing(root: str, suffix: str, url_prefix: str) -> str:
+    """Return a ``<ul>`` of links to files under ``root`` ending in ``suffix``.
+
+    Each link points at ``url_prefix`` followed by the file's path
+    relative to ``root``.  Both the file list and the rendered markup are
+    cached until the modification time of ``root`` changes or
+    ``LISTING_TTL`` seconds pass, whichever comes first.
+    """
+    try:
+        mtime = os.stat(root).st_mtime
+    except OSError:
+        return "<ul></ul>"
+    now = time.monotonic()
+    with _LISTING_LOCK:
+        cached = _LISTING_CACHE.get(root)
+        if cached and cached[0] == mtime and now - cached[1] < LISTING_TTL:
+            return cached[3]
+        files = sorted(iter_files(root, suffix))
+        parts = ["<ul>"]
+        append = parts.append
+        for rel in files:
+            escaped = html.escape(rel)
+            append("<li><a href='")
+            append(url_prefix)
+            append(escaped)
+            append("'>")
+            append(escaped)
+            append("</a></li>")
+        append("</ul>")
+        rendered = "".join(parts)
+        _LISTING_CACHE[root] = (mtime, now, files, rendered)
+        return rendered
+
+
+# Last scrape status shown on the home page: (formatted date, stale flag).
+# _refresh_home_status replaces it as a whole tuple, so handlers read it
+# without locking.
+_HOME_STATUS: tuple[str, bool] = ("Never", True)
+# Seconds between background refreshes of the home page status
+HOME_STATUS_POLL_INTERVAL = 60.0
+
+
+def _refresh_home_status() -> None:
+    """Re‑read the last scrape timestamp and update ``_HOME_STATUS``."""
+    global _HOME_STATUS
+    stale = SCRAPER.needs_update()
+    try:
+        with open(SCRAPER.last_scrape_file) as f:
+            last_ts = int(f.read().strip())
+            last_str = time.strftime("%Y-%m-%d", time.localtime(last_ts))
+    except Exception:
+        last_str = "Never"
+    _HOME_STATUS = (last_str, stale)
+
+
+def _poll_home_status() -> None:
+    """Refresh the home page status periodically; runs in a daemon thread."""
+    while True:
+        time.sleep(HOME_STATUS_POLL_INTERVAL)
+        try:
+            _refresh_home_status()
+        except Exception as exc:
+            logging.warning("Failed to refresh home page status: %s", exc)
+
+
+_refresh_home_status()
+
+
+# Shell shared by every HTML page.  Compiled once at import; only the
+# title and body are substituted per request.
+_PAGE_TMPL = string.Template(
+    """<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
-  <title>{html.escape(title)}</title>
-  <style>
-    body {{ font-family: Arial, sans-serif; margin: 0; padding: 0; background: #f5f5f5; }}
-    header {{ background: #004d99; color: white; padding: 1rem; }}
-    nav a {{ margin-right: 1rem; color: white; text-decoration: none; }}
-    main {{ padding: 1rem; }}
-    footer {{ margin-top: 2rem; padding: 1rem; font-size: 0.8rem; color: #666; text-align: center; }}
-    .container {{ max-width: 800px; margin: auto; background: white; padding: 2rem; box-shadow: 0 0 10px rgba(0,0,0,0.1); }}
-    form label {{ display: block; margin-top: 1rem; }}
-    form input[type="text"], form input[type="number"], form select {{ width: 100%; padding: 0.5rem; }}
-    form input[type="submit"] {{ margin-top: 1rem; padding: 0.5rem 1rem; background: #004d99; color: white; border: none; cursor: pointer; }}
-    table {{ width: 100%; border-collapse: collapse; margin-top: 1rem; }}
-    table, th, td {{ border: 1px solid #ccc; }}
-    th, td {{ padding: 0.5rem; text-align: left; }}
-    pre {{ background: #f0f0f0; padding: 1rem; overflow-x: auto; }}
-    .alert {{ background: #ffefc4; border-left: 4px solid #ffd42a; padding: 0.5rem 1rem; margin-bottom: 1rem; }}
-  </style>
+  <title>$title</title>
+  <link rel="stylesheet" href="/static/site.css" />
 </head>
 <body>
   <header>
@@ -88,7 +254,7 @@ class WebHandler(BaseHTTPRequestHandler):
   </header>
   <main>
     <div class="container">
-    {body}
+    $body
     </div>
   </main>
   <footer>
@@ -96,33 +262,203 @@ class WebHandler(BaseHTTPRequestHandler):
   </footer>
 </body>
 </html>"""
+)
+
+
+# Stored documents above this size are sent raw rather than as a preview
+PREVIEW_MAX_BYTES = 256 * 1024
+
+
+def _read_text(f: BinaryIO, size: int) -> str:
+    """Decode an open UTF‑8 file of up to ``size`` bytes, ignoring invalid sequences.
+
+    The file is read rather than memory‑mapped: the scraper may replace
+    or rewrite documents while they are being served, and touching a
+    mapping of a file truncated underneath it raises ``SIGBUS``.
+    """
+    return f.read(size).decode("utf-8", "ignore")
+
+
+def _safe_open(root: str, rel_path: str) -> BinaryIO:
+    """Open ``rel_path`` beneath the resolved directory ``root`` for reading.
+
+    The joined path is resolved with ``os.path.realpath`` so ``..``
+    segments, absolute paths and symlinks cannot reach outside ``root``.
+
+    Raises:
+        FileNotFoundError: The path escapes ``root``.
+        OSError: The file cannot be opened (missing, a directory, ...).
+    """
+    local = os.path.realpath(os.path.join(root, rel_path))
+    try:
+        inside = os.path.commonpath([root, local]) == root
+    except ValueError:
+        # Paths on different drives (Windows)
+        inside = False
+    if not inside:
+        raise FileNotFoundError(rel_path)
+    return open(local, "rb")
+
+
+def _escape_text(text: str) -> str:
+    """Escape ``text`` for use as element content, such as inside ``<pre>``.
+
+    Quotes only need escaping inside attribute values, so skipping them
+    saves two full passes over large documents.  Use :func:`html.escape`
+    for anything placed in an attribute.
+    """
+    return html.escape(text, quote=False)
+
+
+def _build_page(title: str, body: str) -> str:
+    """Return a complete HTML page with basic styling."""
+    return _PAGE_TMPL.substitute(title=html.escape(title), body=body)
+
+
+_DIAGNOSTIC_FORM = """
+        <h2>Benefit Diagnostic Survey</h2>
+        <form method="post" action="/diagnostic">
+          <label>Age: <input type="number" name="age" min="0" required></label>
+          <label>Do you have a partner or spouse?
+            <select name="partner">
+              <option value="yes">Yes</option>
+              <option value="no" selected>No</option>
+            </select>
+          </label>
+          <label>Do you care for any dependent children or disabled family members?
+            <select name="dependents">
+              <option value="yes">Yes</option>
+              <option value="no" selected>No</option>
+            </select>
+          </label>
+          <label>Approximate weekly income (NZD): <input type="number" name="income" min="0" step="0.01" required></label>
+          <label>Employment status:
+            <select name="employment">
+              <option value="employed">Employed</option>
+              <option value="unemployed">Unemployed</option>
+              <option value="student">Student</option>
+              <option value="retired">Retired</option>
+            </select>
+          </label>
+          <label>Housing situation:
+            <select name="housing">
+              <option value="own">Own</option>
+              <option value="rent" selected>Rent</option>
+              <option value="social-housing">Social Housing</option>
+              <option value="homeless">Homeless</option>
+              <option value="other">Other</option>
+            </select>
+          </label>
+          <label>Do you have valid NZ identification (passport or driver's licence)?
+            <select name="id">
+              <option value="yes">Yes</option>
+              <option value="no" selected>No</option>
+            </select>
+          </label>
+          <label>Do you have a bank account?
+            <select name="bank">
+              <option value="yes">Yes</option>
+              <option value="no" selected>No</option>
+            </select>
+          </label>
+          <input type="submit" value="Get Suggestions">
+        </form>
+        """
+
+_UPLOAD_FORM = """
+        <h2>Upload Letter for Analysis</h2>
+        <p>Select a PDF or image file containing a letter from Work and Income. The text will be extracted (if possible) and analysed to highlight important information.</p>
+        <form method="post" action="/upload" enctype="multipart/form-data">
+          <input type="file" name="letter" accept=".pdf,.png,.jpg,.jpeg,.bmp,.gif,.tiff" required>
+          <input type="submit" value="Analyse Letter">
+        </form>
+        """
+
+# Pages that never change are rendered and encoded once at import
+_DIAGNOSTIC_GET_BYTES = _build_page("Diagnostic Survey", _DIAGNOSTIC_FORM).encode("utf-8")
+_UPLOAD_GET_BYTES = _build_page("Upload Letter", _UPLOAD_FORM).encode("utf-8")
+
+# The diagnostic result page is pre-encoded around the suggestion list,
+# which is the only part that varies between answers
+_DIAGNOSTIC_RESULT_PREFIX, _DIAGNOSTIC_RESULT_SUFFIX = (
+    _build_page(
+        "Diagnostic Results",
+        """
+        <h2>Suggested Benefits</h2>
+        <ul>\0</ul>
+        <h3>General Next Steps</h3>
+        <ul>"""
+        + "".join(f"<li>{html.escape(step)}</li>" for step in diagnostic.NEXT_STEPS)
+        + """</ul>
+        <p><a href="/diagnostic">Back to survey</a></p>
+        """,
+    )
+    .encode("utf-8")
+    .split(b"\0")
+)
+_SUGGESTION_ITEMS = {
+    item: f"<li>{html.escape(item)}</li>".encode("utf-8") for item in diagnostic.SUGGESTIONS
+}
+
+
+class WebHandler(BaseHTTPRequestHandler):
+    """Handle HTTP requests for the Work and Income helper site."""
+
+    # Keep connections open between requests; every response sets
+    # Content-Length so the client knows where each body ends
+    protocol_version = "HTTP/1.1"
+    # Drop idle keep-alive connections so they do not hold a thread forever
+    timeout = 30
+
+    def _render_page(self, title: str, body: str) -> None:
+        """Helper to send a complete HTML page with basic styling."""
+        self._send_page_bytes(_build_page(title, body).encode("utf-8"))
+
+    def _send_page_bytes(self, content: bytes | bytearray) -> None:
+        """Send an already rendered and encoded HTML page."""
         self.send_response(200)
         self.send_header("Content-type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Connection", "keep-alive")
         self.end_headers()
-        self.wfile.write(content.encode("utf-8"))
+        self.wfile.write(content)
 
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
         path = parsed.path
-        query = parse_qs(parsed.query)
+        try:
+            query = dict(parse_qsl(parsed.query, max_num_fields=MAX_FORM_FIELDS))
+        except ValueError:
+            self.send_error(400, "Too many query parameters")
+            return
         if path == "/":
             self._handle_home()
         elif path == "/diagnostic":
             self._handle_diagnostic_get()
         elif path == "/documents":
             # Optional manual update via ?update=1
-            if query.get("update") == ["1"]:
-                threading.Thread(target=SCRAPER.run_update, kwargs={"force": True}).start()
-                message = "Update started in background.  Refresh the page shortly to see new documents."
+            if query.get("update") == "1":
+                if request_scrape():
+                    message = "Update started in background.  Refresh the page shortly to see new documents."
+                else:
+                    message = "An update is already running.  Refresh the page shortly to see new documents."
             else:
                 message = None
             self._handle_documents(message)
+        elif path.startswith("/documents/raw/html/"):
+            rel = path[len("/documents/raw/html/") :]
+            self._serve_raw_file(_HTML_ROOT, rel)
+        elif path.startswith("/documents/raw/pdf_text/"):
+            rel = path[len("/documents/raw/pdf_text/") :]
+            self._serve_raw_file(_TEXT_ROOT, rel)
         elif path.startswith("/documents/html/"):
             rel = path[len("/documents/html/") :]
             self._serve_html_file(rel)
         elif path.startswith("/documents/pdf_text/"):
             rel = path[len("/documents/pdf_text/") :]
             self._serve_pdf_text_file(rel)
+        elif path.startswith("/static/"):
+            self._serve_static(path[len("/static/") :])
         elif path == "/upload":
             self._handle_upload_get()
         else:
@@ -140,13 +476,7 @@ class WebHandler(BaseHTTPRequestHandler):
 
     def _handle_home(self) -> None:
         # Check if data is stale and show warning
-        stale = SCRAPER.needs_update()
-        try:
-            with open(SCRAPER.last_scrape_file) as f:
-                last_ts = int(f.read().strip())
-                last_str = time.strftime("%Y-%m-%d", time.localtime(last_ts))
-        except Exception:
-            last_str = "Never"
+        last_str, stale = _HOME_STATUS
         body_parts = []
         if stale:
             body_parts.append(
@@ -164,74 +494,29 @@ class WebHandler(BaseHTTPRequestHandler):
         self._render_page("Home", "\n".join(body_parts))
 
     def _handle_diagnostic_get(self) -> None:
-        form_html = """
-        <h2>Benefit Diagnostic Survey</h2>
-        <form method="post" action="/diagnostic">
-          <label>Age: <input type="number" name="age" min="0" required></label>
-          <label>Do you have a partner or spouse?
-            <select name="partner">
-              <option value="yes">Yes</option>
-              <option value="no" selected>No</option>
-            </select>
-          </label>
-          <label>Do you care for any dependent children or disabled family members?
-            <select name="dependents">
-              <option value="yes">Yes</option>
-              <option value="no" selected>No</option>
-            </select>
-          </label>
-          <label>Approximate weekly income (NZD): <input type="number" name="income" min="0" step="0.01" required></label>
-          <label>Employment status:
-            <select name="employment">
-              <option value="employed">Employed</option>
-              <option value="unemployed">Unemployed</option>
-              <option value="student">Student</option>
-              <option value="retired">Retired</option>
-            </select>
-          </label>
-          <label>Housing situation:
-            <select name="housing">
-              <option value="own">Own</option>
-              <option value="rent" selected>Rent</option>
-              <option value="social-housing">Social Housing</option>
-              <option value="homeless">Homeless</option>
-              <option value="other">Other</option>
-            </select>
-          </label>
-          <label>Do you have valid NZ identification (passport or driver's licence)?
-            <select name="id">
-              <option value="yes">Yes</option>
-              <option value="no" selected>No</option>
-            </select>
-          </label>
-          <label>Do you have a bank account?
-            <select name="bank">
-              <option value="yes">Yes</option>
-              <option value="no" selected>No</option>
-            </select>
-          </label>
-          <input type="submit" value="Get Suggestions">
-        </form>
-        """
-        self._render_page("Diagnostic Survey", form_html)
+        self._send_page_bytes(_DIAGNOSTIC_GET_BYTES)
 
     def _handle_diagnostic_post(self) -> None:
         # Read and parse POST data
         length = int(self.headers.get("Content-Length", "0"))
         data = self.rfile.read(length).decode("utf-8")
-        params = parse_qs(data)
         try:
-            age = int(params.get("age", ["0"])[0])
-            weekly_income = float(params.get("income", ["0"])[0])
+            params = dict(parse_qsl(data, max_num_fields=MAX_FORM_FIELDS))
+        except ValueError:
+            self.send_error(400, "Too many form fields")
+            return
+        try:
+            age = int(params.get("age", "0"))
+            weekly_income = float(params.get("income", "0"))
         except ValueError:
             self._render_page("Error", "<p>Invalid numeric input. Please go back and try again.</p>")
             return
-        has_partner = params.get("partner", ["no"])[0].lower() == "yes"
-        has_dependents = params.get("dependents", ["no"])[0].lower() == "yes"
-        employment_status = params.get("employment", ["unemployed"])[0].lower()
-        housing_status = params.get("housing", ["rent"])[0].lower()
-        has_id = params.get("id", ["no"])[0].lower() == "yes"
-        has_bank = params.get("bank", ["no"])[0].lower() == "yes"
+        has_partner = params.get("partner", "no").lower() == "yes"
+        has_dependents = params.get("dependents", "no").lower() == "yes"
+        employment_status = params.get("employment", "unemployed").lower()
+        housing_status = params.get("housing", "rent").lower()
+        has_id = params.get("id", "no").lower() == "yes"
+        has_bank = params.get("bank", "no").lower() == "yes"
         result = diagnostic.diagnose(
             age,
             has_partner,
@@ -242,39 +527,17 @@ class WebHandler(BaseHTTPRequestHandler):
             has_id,
             has_bank,
         )
-        suggestions_html = "".join(f"<li>{html.escape(item)}</li>" for item in result["suggestions"])
-        steps_html = "".join(f"<li>{html.escape(step)}</li>" for step in result["next_steps"])
-        body = f"""
-        <h2>Suggested Benefits</h2>
-        <ul>{suggestions_html}</ul>
-        <h3>General Next Steps</h3>
-        <ul>{steps_html}</ul>
-        <p><a href="/diagnostic">Back to survey</a></p>
-        """
-        self._render_page("Diagnostic Results", body)
+        # The next steps are the same for every answer and are already part
+        # of the pre-encoded page; only the suggestions are filled in here
+        buf = bytearray(_DIAGNOSTIC_RESULT_PREFIX)
+        for item in result["suggestions"]:
+            buf += _SUGGESTION_ITEMS.get(item) or f"<li>{html.escape(item)}</li>".encode("utf-8")
+        buf += _DIAGNOSTIC_RESULT_SUFFIX
+        self._send_page_bytes(buf)
 
     def _handle_documents(self, message: str | None = None) -> None:
-        # Build lists of HTML and PDF text files
-        html_files = []
-        for root, _, files in os.walk(SCRAPER.html_dir):
-            for f in files:
-                if f.lower().endswith(".html"):
-                    rel = os.path.relpath(os.path.join(root, f), SCRAPER.html_dir)
-                    html_files.append(rel)
-        pdf_text_files = []
-        for root, _, files in os.walk(SCRAPER.text_dir):
-            for f in files:
-                if f.lower().endswith(".txt"):
-                    rel = os.path.relpath(os.path.join(root, f), SCRAPER.text_dir)
-                    pdf_text_files.append(rel)
-        html_links = "".join(
-            f"<li><a href='/documents/html/{html.escape(rel)}'>{html.escape(rel)}</a></li>"
-            for rel in sorted(html_files)
-        )
-        pdf_links = "".join(
-            f"<li><a href='/documents/pdf_text/{html.escape(rel)}'>{html.escape(rel)}</a></li>"
-            for rel in sorted(pdf_text_files)
-        )
+        html_list = _listing(SCRAPER.html_dir, ".html", "/documents/html/")
+        pdf_list = _listing(SCRAPER.text_dir, ".txt", "/documents/pdf_text/")
         parts = ["<h2>Documents</h2>"]
         if message:
             parts.append(f"<div class=\"alert\">{html.escape(message)}</div>")
@@ -285,52 +548,51 @@ class WebHandler(BaseHTTPRequestHandler):
         parts.append(
             "<p><a href='/documents?update=1'>Run update now</a></p>"
         )
-        parts.append("<h3>HTML Pages</h3><ul>" + html_links + "</ul>")
-        parts.append("<h3>PDF Texts</h3><ul>" + pdf_links + "</ul>")
+        parts.append("<h3>HTML Pages</h3>" + html_list)
+        parts.append("<h3>PDF Texts</h3>" + pdf_list)
         self._render_page("Documents", "\n".join(parts))
 
     def _serve_html_file(self, rel_path: str) -> None:
         # Serve a downloaded HTML file as escaped text so it isn't executed
-        local = os.path.join(SCRAPER.html_dir, rel_path)
-        if not os.path.exists(local):
-            self.send_error(404, "HTML file not found")
-            return
-        try:
-            with open(local, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-        except Exception as exc:
-            self.send_error(500, f"Error reading file: {exc}")
-            return
-        escaped = html.escape(content)
-        body = f"<h2>{html.escape(rel_path)}</h2><pre>{escaped}</pre><p><a href='/documents'>Back to list</a></p>"
-        self._render_page(rel_path, body)
+        self._serve_text_preview(_HTML_ROOT, rel_path, "/documents/raw/html/", "HTML file not found")
 
     def _serve_pdf_text_file(self, rel_path: str) -> None:
         # Serve the extracted text from a PDF
-        local = os.path.join(SCRAPER.text_dir, rel_path)
-        if not os.path.exists(local):
-            self.send_error(404, "Text file not found")
-            return
+        self._serve_text_preview(_TEXT_ROOT, rel_path, "/documents/raw/pdf_text/", "Text file not found")
+
+    def _serve_text_preview(self, root: str, rel_path: str, raw_prefix: str, not_found: str) -> None:
+        """Show a stored file as escaped text inside a normal page.
+
+        Files larger than ``PREVIEW_MAX_BYTES`` are streamed raw instead,
+        since escaping and wrapping them would cost several copies of the
+        whole file in memory.
+        """
+        # Traversal attempts get the same 404 as missing files
         try:
-            with open(local, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-        except Exception as exc:
-            self.send_error(500, f"Error reading file: {exc}")
+            f = _safe_open(root, rel_path)
+        except OSError:
+            self.send_error(404, not_found)
             return
-        escaped = html.escape(content)
-        body = f"<h2>{html.escape(rel_path)}</h2><pre>{escaped}</pre><p><a href='/documents'>Back to list</a></p>"
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size > PREVIEW_MAX_BYTES:
+                self._send_file_zerocopy(f, "text/plain; charset=utf-8")
+                return
+            try:
+                content = _read_text(f, size)
+            except Exception as exc:
+                self.send_error(500, f"Error reading file: {exc}")
+                return
+        escaped = _escape_text(content)
+        body = (
+            f"<h2>{html.escape(rel_path)}</h2><pre>{escaped}</pre>"
+            f"<p><a href='{raw_prefix}{html.escape(rel_path)}'>View raw</a> | "
+            "<a href='/documents'>Back to list</a></p>"
+        )
         self._render_page(rel_path, body)
 
     def _handle_upload_get(self) -> None:
-        form = """
-        <h2>Upload Letter for Analysis</h2>
-        <p>Select a PDF or image file containing a letter from Work and Income. The text will be extracted (if possible) and analysed to highlight important information.</p>
-        <form method="post" action="/upload" enctype="multipart/form-data">
-          <input type="file" name="letter" accept=".pdf,.png,.jpg,.jpeg,.bmp,.gif,.tiff" required>
-          <input type="submit" value="Analyse Letter">
-        </form>
-        """
-        self._render_page("Upload Letter", form)
+        self._send_page_bytes(_UPLOAD_GET_BYTES)
 
     def _handle_upload_post(self) -> None:
         # Parse multipart form data
@@ -346,10 +608,10 @@ class WebHandler(BaseHTTPRequestHandler):
                 "CONTENT_TYPE": self.headers["Content-Type"],
             },
         )
-        file_field = form.getfirst("letter")
-        # FieldStorage returns the value string for text fields, and a FieldStorage
-        # object for files; use the getfirst above to handle both
-        if isinstance(file_field, cgi.FieldStorage):
+        # Indexing returns the FieldStorage item itself (getfirst would return
+        # its decoded value); a repeated field yields a list instead
+        file_field = form["letter"] if "letter" in form else None
+        if isinstance(file_field, cgi.FieldStorage) and file_field.file is not None:
             upload = file_field
         else:
             self._render_page("Error", "<p>No file uploaded. Please go back and try again.</p>")
@@ -362,13 +624,25 @@ class WebHandler(BaseHTTPRequestHandler):
         safe_name = os.path.basename(filename).replace("..", "_")
         save_path = os.path.join(UPLOAD_DIR, safe_name)
         try:
-            with open(save_path, "wb") as f:
-                f.write(upload.file.read())
+            _save_upload(upload.file, save_path)
         except Exception as exc:
             self._render_page("Error", f"<p>Failed to save upload: {html.escape(str(exc))}</p>")
             return
         # Extract text
-        extracted = extract_text(save_path)
+        try:
+            extracted = _extract_text_in_pool(save_path)
+        except FuturesTimeoutError:
+            self._render_page(
+                "Analysis Result",
+                "<p>Extracting text from the uploaded document took too long. Try a smaller file or a PDF containing selectable text.</p>",
+            )
+            return
+        except BrokenProcessPool:
+            self._render_page(
+                "Analysis Result",
+                "<p>Text extraction failed unexpectedly. Please try again.</p>",
+            )
+            return
         if not extracted:
             self._render_page(
                 "Analysis Result",
@@ -384,16 +658,73 @@ class WebHandler(BaseHTTPRequestHandler):
         <h3>Key Lines</h3>
         <ul>{key_lines_html or '<li>No key lines found.</li>'}</ul>
         <h3>Full Extracted Text</h3>
-        <pre>{html.escape(extracted)}</pre>
+        <pre>{_escape_text(extracted)}</pre>
         <p><a href="/upload">Analyse another letter</a></p>
         """
         self._render_page("Letter Analysis", body)
 
+    def _serve_raw_file(self, root: str, rel_path: str) -> None:
+        # Stored documents are sent as plain text so they are never rendered
+        try:
+            f = _safe_open(root, rel_path)
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+        with f:
+            self._send_file_zerocopy(f, "text/plain; charset=utf-8")
+
+    def _serve_static(self, name: str) -> None:
+        try:
+            f = _safe_open(_STATIC_ROOT, name)
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        with f:
+            self._send_file_zerocopy(f, content_type, cache_control=STATIC_CACHE_CONTROL)
+
+    def _send_file_zerocopy(self, f: BinaryIO, content_type: str, cache_control: str | None = None) -> None:
+        """Stream an open file to the client unmodified.
+
+        The body is handed to the kernel with ``sendfile`` so it is never
+        copied into Python memory.  Callers choose the content type and
+        remain responsible for closing ``f``.
+        """
+        size = os.fstat(f.fileno()).st_size
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(size))
+        self.send_header("X-Content-Type-Options", "nosniff")
+        if cache_control:
+            self.send_header("Cache-Control", cache_control)
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        # socket.sendfile uses os.sendfile where available and falls
+        # back to plain send() elsewhere
+        self.connection.sendfile(f, 0, size)
+
 
 def run_server(port: int = 8000) -> None:
-    """Start the HTTP server on the specified port."""
+    """Start the HTTP server on the specified port.
+
+    Requests are served concurrently, one thread per connection, so a
+    long‑running upload or document view does not stall other clients.
+    """
     server_address = ("", port)
-    httpd = HTTPServer(server_address, WebHandler)
+    httpd = ThreadingHTTPServer(server_address, WebHandler)
+    # Do not let in‑flight requests keep the process alive on shutdown
+    httpd.daemon_threads = True
+    threading.Thread(target=_poll_home_status, name="home-status", daemon=True).start()
+    # A single background thread performs all site updates: it scrapes when
+    # the data goes stale and whenever /documents?update=1 wakes it
+    threading.Thread(
+        target=run_periodic_scrape,
+        args=(SCRAPER, UPDATE_INTERVAL_DAYS),
+        name="scrape",
+        daemon=True,
+    ).start()
     print(f"Serving on http://localhost:{port} ...")
     try:
         httpd.serve_forever()
@@ -405,9 +736,5 @@ def run_server(port: int = 8000) -> None:
 
 if __name__ == "__main__":
     # Configure basic logging
-    import logging
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
-    # Start a background update if the data is stale
-    if SCRAPER.needs_update():
-        threading.Thread(target=SCRAPER.run_update, kwargs={"force": True}).start()
     run_server(port=8000)
\ No newline at end of file
@@ -0,0 +1,486 @@
+"""
+crawl_utils.py
+==============
+
+Helpers shared by the crawlers in :mod:`scraper` and :mod:`nav_scraper`.
+
+Fetching pages is dominated by network latency, so both crawlers visit
+URLs concurrently from a small thread pool.  This module provides the
+pieces they have in common: an HTTP session whose connection pool is
+sized for that concurrency, a rate limiter that keeps the combined
+request rate polite towards the remote server, a breadth‑first crawl
+driver that fans page visits out to worker threads, a cached URL
+parser, a directory walker, a persistent index of fetched URLs so
+recently fetched or unchanged pages are not downloaded again, helpers
+that stream large downloads to disk or write pages on a background
+thread, and a fast extractor for the
+``<a href>`` links of a page.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Set
+from urllib.parse import ParseResult, urlparse
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+
+try:
+    import lxml  # type: ignore  # noqa: F401
+    HTML_PARSER = "lxml"
+except Exception:
+    HTML_PARSER = "html.parser"
+
+# Number of pages fetched concurrently by default
+DEFAULT_WORKERS = 8
+
+# Number of parsed URLs kept by parse_url
+URL_CACHE_SIZE = 65536
+
+# Pages waiting for the background writer before crawler workers block
+WRITE_QUEUE_SIZE = 256
+
+# Size of the chunks streamed downloads are written in
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Only anchors with an href are needed to follow links
+_LINKS_ONLY = SoupStrainer("a", href=True)
+# The href attribute of an <a> start tag, double-, single- or unquoted.
+# Quoted values of earlier attributes are consumed whole, so "href=" inside
+# e.g. a title is not mistaken for the attribute.
+_HREF_RE = re.compile(
+    r"""<a\s(?:[^>"']|"[^"]*"|'[^']*')*?(?<=\s)href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.IGNORECASE,
+)
+# HTML comments, which may contain commented-out links
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# Any <a> start tag, to notice markup the href pattern could not read
+_ANCHOR_RE = re.compile(r"<a\s", re.IGNORECASE)
+
+
+def make_session(workers: int = DEFAULT_WORKERS) -> requests.Session:
+    """Return a ``requests`` session able to keep a connection per worker alive.
+
+    Args:
+        workers: Number of threads that will share the session.
+
+    Returns:
+        A session whose HTTP and HTTPS adapters pool enough connections
+        that concurrent workers reuse them instead of reconnecting.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(32, workers))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def parse_url(url: str) -> ParseResult:
+    """Return ``urlparse(url)``, memoised.
+
+    Pages on one site link to the same URLs over and over, and every
+    followed link is parsed again when it is visited, so most calls are
+    answered from the cache.
+    """
+    return urlparse(url)
+
+
+def iter_files(root: str, suffix: str) -> Iterator[str]:
+    """Yield paths relative to ``root`` of files whose names end in ``suffix``.
+
+    Uses ``os.scandir`` directly: directory entries carry their type, so
+    unlike ``os.walk`` no extra ``stat`` is needed per entry and no
+    per‑directory lists are built.  ``suffix`` is matched case‑insensitively
+    and should be lower case.  Unreadable directories are skipped.
+    """
+    stack = [(root, "")]
+    while stack:
+        path, rel = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, os.path.join(rel, entry.name)))
+                    elif entry.name.lower().endswith(suffix):
+                        yield os.path.join(rel, entry.name)
+        except OSError:
+            continue
+
+
+def start_crawl(marker_path: str) -> float:
+    """Mark a crawl as in progress and return the time it started.
+
+    If ``marker_path`` is left over from a crawl that never finished, that
+    crawl's start time is returned instead, so the URLs it already fetched
+    can be skipped when resuming.  Otherwise the current time is recorded
+    and returned.  :func:`finish_crawl` removes the marker.
+    """
+    try:
+        with open(marker_path, "r") as f:
+            started = float(f.read().strip())
+        logging.info("Resuming an interrupted crawl started at %s", time.ctime(started))
+        return started
+    except (OSError, ValueError):
+        pass
+    started = time.time()
+    with open(marker_path, "w") as f:
+        f.write(repr(started))
+    return started
+
+
+def finish_crawl(marker_path: str) -> None:
+    """Remove the marker written by :func:`start_crawl` once a crawl completes."""
+    try:
+        os.remove(marker_path)
+    except FileNotFoundError:
+        pass
+
+
+class RateLimiter:
+    """Space requests at least ``interval`` seconds apart across all threads.
+
+    Each call to :meth:`wait` reserves the next free slot and sleeps until
+    it arrives, so the combined request rate of every worker never
+    exceeds one per ``interval`` seconds.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def crawl(
+    start_url: str,
+    visit: Callable[[str], Iterable[str]],
+    workers: int = DEFAULT_WORKERS,
+    visited: Set[str] | None = None,
+) -> None:
+    """Crawl outwards from ``start_url`` using a pool of worker threads.
+
+    ``visit`` is called once per URL on a worker thread.  It should fetch
+    and store the page and return the URLs it links to that are worth
+    following.  New URLs are de‑duplicated on the calling thread, so
+    ``visit`` does not need to consult ``visited`` itself.
+
+    Args:
+        start_url: First URL to visit.
+        visit: Callable processing one URL and returning links to follow.
+        workers: Maximum number of URLs processed concurrently.
+        visited: Optional set of URLs already seen.  It is updated in
+            place and URLs in it are not visited again.
+    """
+    if visited is None:
+        visited = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl") as pool:
+        pending: Dict[Future, str] = {}
+
+        def submit(url: str) -> None:
+            if url not in visited:
+                visited.add(url)
+                pending[pool.submit(visit, url)] = url
+
+        submit(start_url)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    links = future.result()
+                except Exception as exc:
+                    logging.warning("Error while processing %s: %s", url, exc)
+                    continue
+                for link in links:
+                    submit(link)
+
+
+class UrlRecord(NamedTuple):
+    """What :class:`UrlIndex` knows about a previously fetched URL."""
+
+    etag: str
+    last_modified: str
+    path: str
+    sha256: str
+    fetched_at: float
+
+
+class UrlIndex:
+    """Persistent index of fetched URLs, kept in an SQLite database.
+
+    For each URL it records the local path the response was saved to, the
+    ``ETag`` and ``Last-Modified`` validators, a SHA‑256 digest of the
+    body and when it was fetched.  Crawlers use it to skip URLs already
+    fetched when an interrupted crawl is resumed, to
+    send conditional requests so unchanged resources cost a ``304``
+    reply, and to avoid rewriting files whose content has not changed.
+
+    Every update is committed immediately so the index survives an
+    interrupted crawl.  Methods may be called from several threads.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " path TEXT, sha256 TEXT, fetched_at REAL)"
+        )
+        self._db.commit()
+
+    def get(self, url: str) -> UrlRecord | None:
+        """Return the stored record for ``url``, or ``None`` if it was never fetched."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, path, sha256, fetched_at FROM urls WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return UrlRecord(*row) if row else None
+
+    @staticmethod
+    def fetched_since(record: UrlRecord | None, since: float) -> bool:
+        """Return True if ``record`` was fetched at or after ``since`` and its file exists."""
+        return (
+            record is not None
+            and record.fetched_at >= since
+            and os.path.exists(record.path)
+        )
+
+    @staticmethod
+    def request_headers(record: UrlRecord | None) -> Dict[str, str]:
+        """Return conditional request headers for a previously fetched URL.
+
+        Validators are only sent while the local copy still exists, since
+        a ``304`` reply would otherwise leave nothing to read.
+        """
+        if record is None or not os.path.exists(record.path):
+            return {}
+        headers = {}
+        if record.etag:
+            headers["If-None-Match"] = record.etag
+        if record.last_modified:
+            headers["If-Modified-Since"] = record.last_modified
+        return headers
+
+    def record(
+        self, url: str, response: requests.Response, local_path: str, sha256: str = ""
+    ) -> None:
+        """Store a successful ``response`` for ``url`` that was saved at ``local_path``."""
+        row = (
+            url,
+            response.headers.get("ETag", ""),
+            response.headers.get("Last-Modified", ""),
+            local_path,
+            sha256,
+            time.time(),
+        )
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?, ?)", row)
+            self._db.commit()
+
+    def touch(self, url: str) -> None:
+        """Mark ``url`` as fetched now, after the server reported it unchanged."""
+        with self._lock:
+            self._db.execute("UPDATE urls SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+def remote_size_matches(session: requests.Session, url: str, path: str) -> bool:
+    """Check with a ``HEAD`` request whether ``path`` is as large as ``url``.
+
+    Args:
+        session: Session used for the request.
+        url: Remote resource to check.
+        path: Existing local copy of the resource.
+
+    Returns:
+        ``True`` if the server reports a ``Content-Length`` equal to the
+        size of ``path``; ``False`` if it differs, is not reported or the
+        request fails.
+    """
+    try:
+        head = session.head(url, allow_redirects=True, timeout=30)
+        size = os.path.getsize(path)
+    except (requests.RequestException, OSError) as exc:
+        logging.warning("HEAD check failed for %s: %s", url, exc)
+        return False
+    length = head.headers.get("Content-Length", "")
+    return head.status_code == 200 and length.isdigit() and int(length) == size
+
+
+def _temp_path(path: str) -> str:
+    """Return a unique temporary file name next to ``path``.
+
+    The temporary file is opened with mode ``"xb"`` rather than created by
+    :mod:`tempfile`, so it gets the usual umask‑derived permissions
+    instead of ``0600``, and keeps them when it is renamed over ``path``.
+    """
+    return f"{path}.{uuid.uuid4().hex}.part"
+
+
+def save_streamed(response: requests.Response, path: str) -> str:
+    """Write the body of a streamed ``response`` to ``path`` chunk by chunk.
+
+    The body is never held in memory as a whole.  It is written to a
+    temporary file in the same directory which then replaces ``path``,
+    so readers never see a partially downloaded file.
+
+    Args:
+        response: A response requested with ``stream=True``.
+        path: Destination file.
+
+    Returns:
+        The hex SHA‑256 digest of the body.
+    """
+    digest = hashlib.sha256()
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, "xb") as f:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return digest.hexdigest()
+
+
+class BackgroundWriter:
+    """Write text files on a dedicated thread.
+
+    Crawler workers hand finished pages to :meth:`write_text` and carry on
+    parsing links and fetching, while a single writer thread absorbs the
+    disk latency.  The queue is bounded, so a disk that cannot keep up
+    eventually slows the crawl down rather than filling memory.  Call
+    :meth:`close` to wait for all pending writes.
+    """
+
+    def __init__(self, queue_size: int = WRITE_QUEUE_SIZE) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="file-writer", daemon=True)
+        self._thread.start()
+
+    def write_text(
+        self,
+        path: str,
+        text: str,
+        previous_sha256: str = "",
+        on_written: Callable[[str], None] | None = None,
+    ) -> str:
+        """Queue ``text`` to be written to ``path`` as UTF‑8 unless it is unchanged.
+
+        Args:
+            path: Destination file.  Missing parent directories are created.
+            text: Content to write.
+            previous_sha256: Digest recorded when ``path`` was last written.
+                If it matches ``text`` and the file still exists, nothing
+                is written.
+            on_written: Called with the digest once the file is on disk,
+                or straight away if it was unchanged.  It is not called if
+                the write fails.
+
+        Returns:
+            The hex SHA‑256 digest of the UTF‑8 encoded ``text``.
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if digest == previous_sha256 and os.path.exists(path):
+            if on_written is not None:
+                on_written(digest)
+        else:
+            self._queue.put((path, data, digest, on_written))
+        return digest
+
+    def close(self) -> None:
+        """Wait for queued writes to finish and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, data, digest, on_written = item
+            tmp_path = _temp_path(path)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Replace the file atomically, as save_streamed does, so a
+                # crash mid‑write never leaves a truncated page behind
+                with open(tmp_path, "xb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                if on_written is not None:
+                    on_written(digest)
+            except Exception as exc:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                logging.warning("Failed to write %s: %s", path, exc)
+
+
+def extract_hrefs(html_text: str) -> List[str]:
+    """Return the ``href`` of every ``<a>`` element in ``html_text``.
+
+    Links are found with a regular expression over the start tags, which
+    is much faster than building even a partial document tree.  If the
+    page has ``<a>`` tags but the expression finds no ``href`` in it, the
+    markup is assumed to be too unusual for it and BeautifulSoup is used
+    instead, with the ``lxml`` parser when it is installed and the
+    standard library ``html.parser`` otherwise.
+
+    Args:
+        html_text: The HTML document to scan.
+
+    Returns:
+        The unresolved ``href`` values, with character references
+        decoded, in document order.
+    """
+    if "<!--" in html_text:
+        html_text = _COMMENT_RE.sub("", html_text)
+    hrefs = [html.unescape(dq or sq or bare) for dq, sq, bare in _HREF_RE.findall(html_text)]
+    if hrefs or not _ANCHOR_RE.search(html_text):
+        return hrefs
+    return _extract_hrefs_soup(html_text)
+
+
+def _extract_hrefs_soup(html_text: str) -> List[str]:
+    """Return the ``href`` of every ``<a>`` element using BeautifulSoup."""
+    soup = BeautifulSoup(html_text, HTML_PARSER, parse_only=_LINKS_ONLY)
+    return [a["href"] for a in soup.find_all("a", href=True)]
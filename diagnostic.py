@@ -15,7 +15,102 @@ towards potential benefits they may wish to investigate further.
 
 from __future__ import annotations
 
-from typing import Dict, List
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+# Employment statuses that qualify for Jobseeker Support
+_JOBSEEKER_STATUSES = frozenset({"unemployed", "student"})
+# Answers accepted as "yes" by the CLI survey
+_YES_ANSWERS = frozenset({"yes", "y"})
+
+# Each rule receives the normalised arguments of :func:`_diagnose_cached`
+# in order and maps to the suggestion shown when it matches.  Rules are
+# evaluated in order.
+_RULES: Tuple[Tuple[Callable[..., bool], str], ...] = (
+    (
+        lambda age, partner, deps, band, employment, housing, has_id, bank: (
+            age >= 16 and employment in _JOBSEEKER_STATUSES
+        ),
+        "Jobseeker Support",
+    ),
+    (
+        lambda age, partner, deps, band, employment, housing, has_id, bank: (
+            deps and band <= 2  # under $1500
+        ),
+        "Sole Parent Support or Childcare Subsidy",
+    ),
+    (
+        lambda age, partner, deps, band, employment, housing, has_id, bank: (
+            band == 0  # $600 or less
+        ),
+        "Accommodation Supplement",
+    ),
+    (
+        lambda age, partner, deps, band, employment, housing, has_id, bank: age >= 65,
+        "New Zealand Superannuation or Veteran's Pension",
+    ),
+    (
+        lambda age, partner, deps, band, employment, housing, has_id, bank: (
+            partner and band <= 1  # under $800
+        ),
+        "Couples assistance such as Supported Living Payment",
+    ),
+)
+
+FALLBACK_SUGGESTION = "We could not determine a specific benefit based on the information provided."
+
+# Every suggestion :func:`diagnose` can return
+SUGGESTIONS: Tuple[str, ...] = tuple(suggestion for _, suggestion in _RULES) + (FALLBACK_SUGGESTION,)
+
+NEXT_STEPS: Tuple[str, ...] = (
+    "Check the eligibility criteria for each suggested benefit on the Work and Income website.",
+    "Gather necessary documents such as identification, proof of address, bank account details, and income evidence.",
+    "Apply online via MyMSD or by contacting Work and Income directly.",
+    "Keep copies of any letters or emails you receive from Work and Income, including sanction letters.",
+    "If you receive a sanction letter, use the document upload tool to extract text and seek help if needed.",
+)
+
+
+def _income_band(weekly_income: float) -> int:
+    """Collapse a weekly income onto the bands the rules distinguish.
+
+    Returns 0 for $600 or less, 1 for under $800, 2 for under $1500 and
+    3 otherwise.  Keeping the cache key to a handful of values lets
+    users with different incomes but identical outcomes share entries.
+    """
+    if weekly_income <= 600:
+        return 0
+    if weekly_income < 800:
+        return 1
+    if weekly_income < 1500:
+        return 2
+    return 3
+
+
+@lru_cache(maxsize=2048)
+def _diagnose_cached(
+    age: int,
+    has_partner: bool,
+    has_dependents: bool,
+    income_band: int,
+    employment_status: str,
+    housing_status: str,
+    has_id: bool,
+    has_bank_account: bool,
+) -> Tuple[str, ...]:
+    """Return the matching suggestions as an immutable, cacheable tuple."""
+    args = (
+        age,
+        has_partner,
+        has_dependents,
+        income_band,
+        employment_status,
+        housing_status,
+        has_id,
+        has_bank_account,
+    )
+    suggestions = tuple(suggestion for rule, suggestion in _RULES if rule(*args))
+    return suggestions or (FALLBACK_SUGGESTION,)
 
 
 def diagnose(
@@ -48,34 +143,18 @@ def diagnose(
         names or descriptions the user should look into, and ``next_steps``, a
         list of general recommendations.
     """
-    suggestions: List[str] = []
-    # Jobseeker Support
-    if age >= 16 and employment_status in {"unemployed", "student"}:
-        suggestions.append("Jobseeker Support")
-    # Sole Parent Support or Childcare Subsidy
-    if has_dependents and weekly_income < 1500:
-        suggestions.append("Sole Parent Support or Childcare Subsidy")
-    # Accommodation Supplement
-    if weekly_income <= 600:
-        suggestions.append("Accommodation Supplement")
-    # Superannuation
-    if age >= 65:
-        suggestions.append("New Zealand Superannuation or Veteran's Pension")
-    # Couples assistance
-    if has_partner and weekly_income < 800:
-        suggestions.append("Couples assistance such as Supported Living Payment")
-    if not suggestions:
-        suggestions.append(
-            "We could not determine a specific benefit based on the information provided."
-        )
-    next_steps = [
-        "Check the eligibility criteria for each suggested benefit on the Work and Income website.",
-        "Gather necessary documents such as identification, proof of address, bank account details, and income evidence.",
-        "Apply online via MyMSD or by contacting Work and Income directly.",
-        "Keep copies of any letters or emails you receive from Work and Income, including sanction letters.",
-        "If you receive a sanction letter, use the document upload tool to extract text and seek help if needed.",
-    ]
-    return {"suggestions": suggestions, "next_steps": next_steps}
+    suggestions = _diagnose_cached(
+        age,
+        has_partner,
+        has_dependents,
+        _income_band(weekly_income),
+        employment_status,
+        housing_status,
+        has_id,
+        has_bank_account,
+    )
+    # Hand out fresh lists so callers cannot alter the cached result
+    return {"suggestions": list(suggestions), "next_steps": list(NEXT_STEPS)}
 
 
 def run_cli_survey() -> None:
@@ -97,11 +176,11 @@ def run_cli_survey() -> None:
     partner_inp = input(
         "2. Do you have a partner or spouse? (yes/no) "
     ).strip().lower()
-    has_partner = partner_inp in {"yes", "y"}
+    has_partner = partner_inp in _YES_ANSWERS
     deps_inp = input(
         "3. Do you care for any dependent children or disabled family members? (yes/no) "
     ).strip().lower()
-    has_dependents = deps_inp in {"yes", "y"}
+    has_dependents = deps_inp in _YES_ANSWERS
     income_str = input(
         "4. What is your approximate weekly income in NZD? (enter a number) "
     ).strip()
@@ -119,11 +198,11 @@ def run_cli_survey() -> None:
     id_inp = input(
         "7. Do you have valid NZ identification (passport/driver's licence) available? (yes/no) "
     ).strip().lower()
-    has_id = id_inp in {"yes", "y"}
+    has_id = id_inp in _YES_ANSWERS
     bank_inp = input(
         "8. Do you have a bank account? (yes/no) "
     ).strip().lower()
-    has_bank = bank_inp in {"yes", "y"}
+    has_bank = bank_inp in _YES_ANSWERS
     result = diagnose(
         age,
         has_partner,
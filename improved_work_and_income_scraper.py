@@ -47,12 +47,43 @@ from scraper import WorkAndIncomeScraper
 from nav_scraper import NavScraper
 
 
+# Set by :func:`request_scrape` to cut short the wait between periodic scrapes
+_WAKE = threading.Event()
+# True while a periodic cycle is checking or updating the data.  Guarded by
+# _UPDATE_LOCK so a request cannot slip in between the check and the clear
+# of _WAKE at the start of a cycle.
+_updating = False
+_UPDATE_LOCK = threading.Lock()
+
+# Seconds to wait before retrying after a periodic update failed
+FAILED_UPDATE_RETRY_SECONDS = 60 * 60
+
+
+def request_scrape() -> bool:
+    """Ask a running periodic scrape to update now instead of sleeping.
+
+    Requests made while an update is already in progress are ignored,
+    so repeated requests never queue a second full scrape.
+
+    Returns:
+        True if an update was requested, False if one is already running.
+    """
+    with _UPDATE_LOCK:
+        if _updating:
+            return False
+        _WAKE.set()
+        return True
+
+
 def run_periodic_scrape(scraper: WorkAndIncomeScraper, interval_days: int) -> None:
     """Run the scraper periodically every ``interval_days`` days.
 
     This function runs indefinitely in the foreground.  Each cycle
-    waits until the next scheduled run, checks whether the data is
-    stale (older than the interval) and if so performs an update.
+    checks whether the data is stale (older than the interval) and if
+    so performs an update, then waits until the data next becomes
+    stale.  A call to :func:`request_scrape` ends the wait early and
+    forces an update.  A failed update is logged and retried after
+    ``FAILED_UPDATE_RETRY_SECONDS`` rather than ending the loop.
 
     Args:
         scraper: The scraper instance to run.
@@ -63,23 +94,46 @@ def run_periodic_scrape(scraper: WorkAndIncomeScraper, interval_days: int) -> No
         "Starting periodic scraping every %s days.  Press Ctrl+C to stop.",
         interval_days,
     )
+    global _updating
     interval_seconds = interval_days * 24 * 3600
+    forced = False
     while True:
-        start = time.time()
-        # Force update if needed (i.e. last scrape older than interval)
-        if scraper.needs_update(days=interval_days):
-            scraper.run_update(force=True)
+        with _UPDATE_LOCK:
+            # Requests are ignored until this cycle's update has finished
+            _updating = True
+            _WAKE.clear()
+        # Force update if requested or needed (i.e. last scrape older than interval)
+        failed = False
+        try:
+            if forced or scraper.needs_update(days=interval_days):
+                scraper.run_update(force=True)
+            else:
+                logging.info("Data is up to date; skipping scrape this cycle.")
+        except Exception:
+            logging.exception("Periodic update failed; retrying in %s seconds.", FAILED_UPDATE_RETRY_SECONDS)
+            failed = True
+        finally:
+            with _UPDATE_LOCK:
+                _updating = False
+        # Sleep until the last scrape is older than the interval, so data
+        # that was nearly stale at startup is not left for another interval
+        last_scrape = scraper.last_scrape_time()
+        if failed:
+            to_sleep = FAILED_UPDATE_RETRY_SECONDS
+        elif last_scrape is None:
+            to_sleep = interval_seconds
         else:
-            logging.info("Data is up to date; skipping scrape this cycle.")
-        # Sleep until next run, adjusted for time taken by update
-        elapsed = time.time() - start
-        to_sleep = max(0, interval_seconds - elapsed)
+            # needs_update compares whole seconds, so wait one past the boundary
+            to_sleep = max(0, last_scrape + interval_seconds + 1 - time.time())
         logging.info("Sleeping for %s seconds until next cycle.", int(to_sleep))
         try:
-            time.sleep(to_sleep)
+            # A failed update is retried even if the data is not yet stale
+            forced = _WAKE.wait(timeout=to_sleep) or failed
         except KeyboardInterrupt:
             logging.info("Periodic scraping interrupted by user.")
             break
+        if forced:
+            logging.info("Update requested; starting next cycle early.")
 
 
 def main() -> None:
@@ -151,9 +205,15 @@ def main() -> None:
                     interval_seconds = args.days * 24 * 3600
                     while True:
                         start = time.time()
-                        nav_scraper.scrape()
+                        _WAKE.clear()
+                        try:
+                            nav_scraper.scrape()
+                        except Exception:
+                            logging.exception("Periodic navigation scrape failed.")
+                            _WAKE.wait(timeout=FAILED_UPDATE_RETRY_SECONDS)
+                            continue
                         elapsed = time.time() - start
-                        time.sleep(max(0, interval_seconds - elapsed))
+                        _WAKE.wait(timeout=max(0, interval_seconds - elapsed))
                 periodic_nav()
             else:
                 run_periodic_scrape(scraper, args.days)
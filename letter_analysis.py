@@ -17,9 +17,14 @@ this lightweight project.
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
 import re
-from typing import Dict, List, Tuple
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Pattern, Tuple, TypeVar
 
 
 KEYWORD_CLASSES: List[Tuple[str, List[str]]] = [
@@ -28,7 +33,86 @@ KEYWORD_CLASSES: List[Tuple[str, List[str]]] = [
     ("Rejection notice", ["rejection", "rejected", "declined", "not eligible", "denied"]),
 ]
 
+# Keywords per class as hashable tuples, for _keyword_pattern
+_CLASS_KEYWORDS: List[Tuple[str, Tuple[str, ...]]] = [
+    (label, tuple(keywords)) for label, keywords in KEYWORD_CLASSES
+]
+
+DEFAULT_KEY_LINE_KEYWORDS: Tuple[str, ...] = ("payment", "benefit", "date", "amount", "deadline", "evidence")
+
+# Number of distinct letters whose analysis results are memoised
+ANALYSIS_CACHE_SIZE = 256
+# Results longer than this (in characters) are not memoised.  A summary of
+# a text without sentence breaks can be the whole letter, which the caches
+# must not keep alive.
+MAX_CACHED_RESULT_CHARS = 4096
+
+# Runs of whitespace, collapsed to a single space before summarising
+_WS_RE = re.compile(r"\s+")
+# A sentence terminator followed by the (collapsed) space before the next sentence
+_SENT_END_RE = re.compile(r"[.!?](?= )")
+# Characters that end a line, as recognised by str.splitlines()
+_LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE = re.compile("[" + _LINE_BREAKS + "]")
+
 
+_R = TypeVar("_R")
+
+
+def _cached_by_digest(func: Callable[..., _R]) -> Callable[..., _R]:
+    """Memoise ``func(text, ...)`` on a SHA‑256 digest of ``text``.
+
+    Unlike :func:`functools.lru_cache` this does not keep the letter texts
+    alive: uploaded letters are personal documents and are rarely analysed
+    twice, so only the digest, the length and small results are retained.
+    Up to ``ANALYSIS_CACHE_SIZE`` results are kept, least recently used
+    first out.
+    """
+    cache: OrderedDict[tuple, _R] = OrderedDict()
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(text: str, *args, **kwargs) -> _R:
+        digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+        key = (digest, len(text), args, tuple(sorted(kwargs.items())))
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        result = func(text, *args, **kwargs)
+        size = len(result) if isinstance(result, str) else sum(map(len, result))
+        if size <= MAX_CACHED_RESULT_CHARS:
+            with lock:
+                cache[key] = result
+                if len(cache) > ANALYSIS_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return result
+
+    wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+    return wrapper
+
+
+@lru_cache(maxsize=32)
+def _keyword_pattern(keywords: Tuple[str, ...], flags: int = 0) -> Pattern[str]:
+    """Compile a pattern matching any of ``keywords`` in lower case."""
+    return re.compile("|".join(re.escape(kw.lower()) for kw in keywords), flags)
+
+
+def _search_text(text: str) -> Tuple[str, int]:
+    """Return the string to scan for lower‑case keywords and the regex flags to use.
+
+    A case‑sensitive pattern over the lower‑cased text scans several
+    times faster than an ``IGNORECASE`` pattern over the original.  A few
+    characters change length when lower‑cased, which would misalign match
+    offsets; such texts are scanned as they are with ``IGNORECASE``.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered, 0
+    return text, re.IGNORECASE
+
+
+@_cached_by_digest
 def classify_letter(text: str) -> str:
     """Classify a letter based on the presence of certain keywords.
 
@@ -39,14 +123,14 @@ def classify_letter(text: str) -> str:
         A classification string.  One of the keys from ``KEYWORD_CLASSES``
         or "General correspondence" if none of the keywords are found.
     """
-    lower = text.lower()
-    for label, keywords in KEYWORD_CLASSES:
-        for kw in keywords:
-            if kw in lower:
-                return label
+    haystack, flags = _search_text(text)
+    for label, keywords in _CLASS_KEYWORDS:
+        if _keyword_pattern(keywords, flags).search(haystack):
+            return label
     return "General correspondence"
 
 
+@_cached_by_digest
 def summarise_letter(text: str, max_sentences: int = 3) -> str:
     """Return a brief summary consisting of up to ``max_sentences`` sentences.
 
@@ -61,12 +145,15 @@ def summarise_letter(text: str, max_sentences: int = 3) -> str:
     Returns:
         A shortened string containing up to ``max_sentences`` sentences.
     """
+    if max_sentences <= 0:
+        return ""
     # Replace newlines with spaces and compress whitespace
-    cleaned = re.sub(r"\s+", " ", text).strip()
-    # Split on sentence terminators
-    sentences = re.split(r"(?<=[.!?])\s+", cleaned)
-    selected = sentences[:max_sentences]
-    return " ".join(selected)
+    cleaned = _WS_RE.sub(" ", text).strip()
+    # Cut after the last wanted sentence instead of splitting them all
+    for count, match in enumerate(_SENT_END_RE.finditer(cleaned), start=1):
+        if count == max_sentences:
+            return cleaned[: match.end()]
+    return cleaned
 
 
 def find_key_lines(text: str, keywords: List[str] | None = None, max_lines: int = 5) -> List[str]:
@@ -83,19 +170,41 @@ def find_key_lines(text: str, keywords: List[str] | None = None, max_lines: int
         any of the supplied keywords.  Lines are de‑duplicated and
         returned in the order they appear in the original text.
     """
-    if keywords is None:
-        keywords = ["payment", "benefit", "date", "amount", "deadline", "evidence"]
-    lower_keywords = [kw.lower() for kw in keywords]
-    lines = []
-    for line in text.splitlines():
-        lower_line = line.lower()
-        if any(kw in lower_line for kw in lower_keywords):
-            stripped = line.strip()
-            if stripped and stripped not in lines:
-                lines.append(stripped)
-        if len(lines) >= max_lines:
+    keywords = DEFAULT_KEY_LINE_KEYWORDS if keywords is None else tuple(keywords)
+    return list(_find_key_lines_cached(text, keywords, max_lines))
+
+
+@_cached_by_digest
+def _find_key_lines_cached(text: str, keywords: Tuple[str, ...], max_lines: int) -> Tuple[str, ...]:
+    """Implementation of :func:`find_key_lines` returning a cacheable tuple.
+
+    Rather than testing every line, the keyword pattern is searched for in
+    the whole text and only the lines around its matches are cut out, so
+    lines without keywords are skipped inside the regex engine.
+    """
+    if not keywords:
+        return ()
+    haystack, flags = _search_text(text)
+    pattern = _keyword_pattern(keywords, flags)
+    lines: List[str] = []
+    seen = set()  # mirrors ``lines`` for constant-time duplicate checks
+    pos = 0  # always the start of a line
+    while len(lines) < max_lines:
+        match = pattern.search(haystack, pos)
+        if match is None:
+            break
+        start = max(text.rfind(ch, pos, match.start()) for ch in _LINE_BREAKS) + 1
+        start = max(start, pos)
+        brk = _LINE_BREAK_RE.search(text, match.end())
+        end = brk.start() if brk else len(text)
+        stripped = text[start:end].strip()
+        if stripped and stripped not in seen:
+            seen.add(stripped)
+            lines.append(stripped)
+        if brk is None:
             break
-    return lines
+        pos = brk.end()
+    return tuple(lines)
 
 
 def analyse_letter(text: str) -> Dict[str, object]:
@@ -20,22 +20,52 @@ import logging
 import os
 import re
 import time
-from collections import deque
-from urllib.parse import urljoin, urlparse
+from functools import partial
+from typing import List
+from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
 
-from ocr_utils import extract_text_from_pdf
+from crawl_utils import (
+    DEFAULT_WORKERS,
+    BackgroundWriter,
+    RateLimiter,
+    UrlIndex,
+    crawl,
+    extract_hrefs,
+    finish_crawl,
+    iter_files,
+    make_session,
+    parse_url,
+    remote_size_matches,
+    save_streamed,
+    start_crawl,
+)
+from ocr_utils import extract_pdfs_to_files, text_is_current
+
+# Characters that are not safe in local file names
+_FNAME_SANITIZE = re.compile(r"[<>:/\\|?*]")
+# Link schemes that are never crawled
+_NON_HTTP_PREFIXES = ("mailto:", "tel:", "javascript:")
+# Whitespace and control characters, which urljoin strips from a URL, so
+# an href containing any of them must be resolved rather than prefix‑matched
+_URL_STRIPPED_CHARS = re.compile(r"[\x00-\x20]")
 
 
 class NavScraper:
     """Scrape only the categories listed in the MAP left navigation."""
 
-    def __init__(self, start_url: str = "https://www.workandincome.govt.nz/map/index.html", output_dir: str = "data", delay: float = 0.3) -> None:
+    def __init__(
+        self,
+        start_url: str = "https://www.workandincome.govt.nz/map/index.html",
+        output_dir: str = "data",
+        delay: float = 0.3,
+        workers: int = DEFAULT_WORKERS,
+    ) -> None:
         self.start_url = start_url
         self.output_dir = output_dir
         self.delay = delay
+        self.workers = workers
         self.html_dir = os.path.join(self.output_dir, "html")
         self.pdf_dir = os.path.join(self.output_dir, "pdfs")
         self.text_dir = os.path.join(self.output_dir, "pdf_text")
@@ -43,22 +73,37 @@ class NavScraper:
         os.makedirs(self.pdf_dir, exist_ok=True)
         os.makedirs(self.text_dir, exist_ok=True)
         self.last_scrape_file = os.path.join(self.output_dir, "last_nav_scrape.txt")
+        self.crawl_marker_file = os.path.join(self.output_dir, "nav_crawl_in_progress.txt")
+        # URLs fetched at or after this time are not requested again (see scrape)
+        self._resume_since = float("inf")
+        self.index_file = os.path.join(self.output_dir, "visited.sqlite")
+        # One pooled session for the navigation page and every category,
+        # so kept-alive connections carry over between them and across runs
+        self._session: requests.Session | None = None
+
+    def _get_session(self) -> requests.Session:
+        """Return the scraper's shared HTTP session, creating it on first use."""
+        if self._session is None:
+            self._session = make_session(self.workers)
+        return self._session
 
     def scrape(self) -> None:
-        """Entry point for scraping the navigation categories."""
+        """Entry point for scraping the navigation categories.
+
+        If the previous navigation scrape was interrupted, URLs it already
+        fetched are not requested again.
+        """
         logging.info("Fetching navigation page %s", self.start_url)
-        resp = requests.get(self.start_url, timeout=30)
+        resp = self._get_session().get(self.start_url, timeout=30)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
         # Find potential category links.  A category link is typically one
         # directory deep under /map/, e.g. /map/card-services/index.html.
         nav_links_set = set()
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
+        for href in extract_hrefs(resp.text):
             if not href.startswith("/map/"):
                 continue
             # Normalise by stripping query and fragment
-            href_parsed = urlparse(href)
+            href_parsed = parse_url(href)
             path = href_parsed.path
             # Split into path segments (discard leading empty segment)
             segments = [seg for seg in path.split("/") if seg]
@@ -71,8 +116,10 @@ class NavScraper:
                 nav_links_set.add(full)
         nav_links = sorted(nav_links_set)
         logging.info("Found %d category links in navigation", len(nav_links))
+        self._resume_since = start_crawl(self.crawl_marker_file)
         for link in nav_links:
             self._crawl_category(link)
+        finish_crawl(self.crawl_marker_file)
         # After crawling all categories, extract PDF text
         self._extract_all_pdfs()
         with open(self.last_scrape_file, "w") as f:
@@ -80,8 +127,12 @@ class NavScraper:
         logging.info("Navigation scrape complete.")
 
     def _crawl_category(self, category_url: str) -> None:
-        """Crawl pages only within a single navigation category."""
-        parsed_start = urlparse(category_url)
+        """Crawl pages only within a single navigation category.
+
+        Up to ``workers`` pages are fetched concurrently, with requests
+        spaced ``delay`` seconds apart across all workers.
+        """
+        parsed_start = parse_url(category_url)
         # Determine base directory of this category.  If the start URL
         # includes a file (e.g. index.html or map-changes.html), drop the
         # filename.  Otherwise treat the path itself as the directory.
@@ -91,75 +142,157 @@ class NavScraper:
         else:
             base_dir = start_path.rstrip("/") + "/"
         base_domain = parsed_start.netloc
-        queue: deque[str] = deque([category_url])
-        visited: set[str] = set()
-        session = requests.Session()
+        session = self._get_session()
+        limiter = RateLimiter(self.delay)
+        index = UrlIndex(self.index_file)
+        writer = BackgroundWriter()
         logging.info("Crawling category %s", category_url)
-        while queue:
-            current_url = queue.popleft()
-            if current_url in visited:
-                continue
-            visited.add(current_url)
+        try:
+            crawl(
+                category_url,
+                partial(self._process_url, session, limiter, index, writer, base_domain, base_dir),
+                workers=self.workers,
+            )
+        finally:
+            writer.close()
+            index.close()
+
+    def _process_url(
+        self,
+        session: requests.Session,
+        limiter: RateLimiter,
+        index: UrlIndex,
+        writer: BackgroundWriter,
+        base_domain: str,
+        base_dir: str,
+        current_url: str,
+    ) -> List[str]:
+        """Download one URL and return the links it contains within the category.
+
+        Pages fetched recently, or that the server reports unchanged, are
+        not downloaded again; their links are read from the saved copy.
+        PDFs are streamed to disk and skipped if a ``HEAD`` request shows
+        the local copy already has the remote size.  HTML is handed to
+        ``writer`` so the disk write overlaps link extraction.
+        """
+        entry = index.get(current_url)
+        if UrlIndex.fetched_since(entry, self._resume_since):
+            return self._links_from_saved(current_url, entry.path, base_domain, base_dir)
+        if current_url.lower().endswith(".pdf"):
+            pdf_path = self._pdf_path(current_url)
+            if os.path.exists(pdf_path):
+                limiter.wait()
+                if remote_size_matches(session, current_url, pdf_path):
+                    return []
+        limiter.wait()
+        try:
+            r = session.get(
+                current_url,
+                headers=UrlIndex.request_headers(entry),
+                stream=True,
+                timeout=30,
+            )
+        except Exception as exc:
+            logging.warning("Failed to fetch %s: %s", current_url, exc)
+            return []
+        if r.status_code == 304 and entry is not None:
+            r.close()
+            index.touch(current_url)
+            return self._links_from_saved(current_url, entry.path, base_domain, base_dir)
+        if r.status_code != 200:
+            logging.warning("Non‑200 status for %s: %s", current_url, r.status_code)
+            r.close()
+            return []
+        ct = r.headers.get("Content-Type", "").lower()
+        if "application/pdf" in ct or current_url.lower().endswith(".pdf"):
+            pdf_path = self._pdf_path(current_url)
             try:
-                r = session.get(current_url, timeout=30)
-            except Exception as exc:
-                logging.warning("Failed to fetch %s: %s", current_url, exc)
-                continue
-            if r.status_code != 200:
-                logging.warning("Non‑200 status for %s: %s", current_url, r.status_code)
-                continue
-            ct = r.headers.get("Content-Type", "").lower()
-            if "application/pdf" in ct or current_url.lower().endswith(".pdf"):
-                filename = re.sub(r"[<>:/\\|?*]", "_", os.path.basename(urlparse(current_url).path))
-                if not filename.lower().endswith(".pdf"):
-                    filename += ".pdf"
-                pdf_path = os.path.join(self.pdf_dir, filename)
-                if not os.path.exists(pdf_path):
-                    with open(pdf_path, "wb") as f:
-                        f.write(r.content)
-                    logging.info("Downloaded PDF: %s", pdf_path)
-                time.sleep(self.delay)
-                continue
-            # Save HTML
-            rel_path = urlparse(current_url).path.lstrip("/")
-            if not rel_path or rel_path.endswith("/"):
-                rel_path += "index.html"
-            local_path = os.path.join(self.html_dir, rel_path)
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            with open(local_path, "w", encoding="utf-8") as f:
-                f.write(r.text)
-            # Parse internal links within the same category
-            page = BeautifulSoup(r.text, "html.parser")
-            for a_tag in page.find_all("a", href=True):
-                href = a_tag["href"]
-                next_url = urljoin(current_url, href)
-                parsed = urlparse(next_url)
-                if parsed.scheme not in {"http", "https"}:
+                digest = save_streamed(r, pdf_path)
+            except (requests.RequestException, OSError) as exc:
+                logging.warning("Failed to download %s: %s", current_url, exc)
+                return []
+            finally:
+                r.close()
+            logging.info("Downloaded PDF: %s", pdf_path)
+            index.record(current_url, r, pdf_path, digest)
+            return []
+        # Save HTML
+        rel_path = parse_url(current_url).path.lstrip("/")
+        if not rel_path or rel_path.endswith("/"):
+            rel_path += "index.html"
+        local_path = os.path.join(self.html_dir, rel_path)
+        writer.write_text(
+            local_path, r.text, entry.sha256 if entry else "", partial(index.record, current_url, r, local_path)
+        )
+        return self._extract_links(current_url, r.text, base_domain, base_dir)
+
+    def _links_from_saved(self, current_url: str, local_path: str, base_domain: str, base_dir: str) -> List[str]:
+        """Return the in‑category links of an unchanged page from its saved copy."""
+        if local_path.lower().endswith(".pdf"):
+            return []
+        try:
+            with open(local_path, "r", encoding="utf-8", errors="ignore") as f:
+                html_text = f.read()
+        except OSError as exc:
+            logging.warning("Cannot read saved copy of %s: %s", current_url, exc)
+            return []
+        return self._extract_links(current_url, html_text, base_domain, base_dir)
+
+    def _pdf_path(self, url: str) -> str:
+        """Return the local path a PDF downloaded from ``url`` is saved to."""
+        filename = _FNAME_SANITIZE.sub("_", os.path.basename(parse_url(url).path))
+        if not filename.lower().endswith(".pdf"):
+            filename += ".pdf"
+        return os.path.join(self.pdf_dir, filename)
+
+    def _extract_links(self, current_url: str, html_text: str, base_domain: str, base_dir: str) -> List[str]:
+        """Return links in ``html_text`` that stay within the category path.
+
+        Most links are root‑relative or absolute, so they are accepted or
+        rejected by comparing string prefixes.  Only relative links, ones
+        with dot segments and ones containing whitespace or control
+        characters are resolved with ``urljoin`` and parsed.
+        """
+        links: List[str] = []
+        origin = f"{parse_url(current_url).scheme}://{base_domain}"
+        category_prefixes = (f"https://{base_domain}{base_dir}", f"http://{base_domain}{base_dir}")
+        for href in extract_hrefs(html_text):
+            # Remove fragment
+            href = href.split("#", 1)[0]
+            if href and "/." not in href and not _URL_STRIPPED_CHARS.search(href):
+                if href.startswith(category_prefixes):
+                    links.append(href)
+                    continue
+                if href.startswith("/") and not href.startswith("//"):
+                    if href.startswith(base_dir):
+                        links.append(origin + href)
                     continue
-                if parsed.netloc != base_domain:
+                if href.startswith(_NON_HTTP_PREFIXES):
                     continue
-                # Only follow links that stay within this category path
-                if parsed.path.startswith(base_dir):
-                    # Remove fragment
-                    norm = parsed._replace(fragment="").geturl()
-                    if norm not in visited:
-                        queue.append(norm)
-            time.sleep(self.delay)
+                if href.startswith(("https://", "http://")):
+                    # An absolute URL with a host is outside the category
+                    # unless it matched the prefixes above
+                    host_start = href.index("//") + 2
+                    if href[host_start : host_start + 1] not in ("", "/", "?"):
+                        continue
+            next_url = urljoin(current_url, href)
+            parsed = parse_url(next_url)
+            if parsed.scheme not in {"http", "https"}:
+                continue
+            if parsed.netloc != base_domain:
+                continue
+            # Only follow links that stay within this category path
+            if parsed.path.startswith(base_dir):
+                links.append(next_url)
+        return links
 
     def _extract_all_pdfs(self) -> None:
-        """Extract text from downloaded PDFs in a navigation scrape."""
-        for root, _, files in os.walk(self.pdf_dir):
-            for name in files:
-                if not name.lower().endswith(".pdf"):
-                    continue
-                pdf_path = os.path.join(root, name)
-                rel = os.path.relpath(pdf_path, self.pdf_dir)
-                txt_rel = os.path.splitext(rel)[0] + ".txt"
-                txt_full = os.path.join(self.text_dir, txt_rel)
-                if os.path.exists(txt_full) and os.path.getsize(txt_full) > 0:
-                    continue
-                logging.info("Extracting text from %s", pdf_path)
-                text = extract_text_from_pdf(pdf_path)
-                os.makedirs(os.path.dirname(txt_full), exist_ok=True)
-                with open(txt_full, "w", encoding="utf-8") as f:
-                    f.write(text)
\ No newline at end of file
+        """Extract text from downloaded PDFs in a navigation scrape, in parallel."""
+        jobs = []
+        for rel in iter_files(self.pdf_dir, ".pdf"):
+            pdf_path = os.path.join(self.pdf_dir, rel)
+            txt_full = os.path.join(self.text_dir, os.path.splitext(rel)[0] + ".txt")
+            if not text_is_current(pdf_path, txt_full):
+                jobs.append((pdf_path, txt_full))
+        logging.info("Extracting text from %d PDFs", len(jobs))
+        extract_pdfs_to_files(jobs)
\ No newline at end of file
@@ -7,10 +7,15 @@ environment in which this application runs may not have access to all
 third‑party OCR libraries, so this module attempts to use whatever tools
 are available.  The preferred method for PDFs is to invoke the
 ``pdftotext`` command from the Poppler suite; this produces reliable
-output without any additional Python dependencies.  If ``pdftotext`` is
+output without any additional Python dependencies.  When the
+``pdftotext`` Python package is installed, the same Poppler code is
+called in‑process instead, avoiding a subprocess per file.  If ``pdftotext`` is
 unavailable and ``pytesseract`` is installed, it falls back to using
 Tesseract OCR on images produced via ``pdf2image``.
 
+Many PDFs can be converted at once with :func:`extract_pdfs_to_files`,
+which spreads the work over a pool of processes.
+
 Functions in this module never throw exceptions – they catch errors and
 return empty strings when text extraction fails.  Logging is used to
 report problems to the caller.
@@ -19,10 +24,17 @@ report problems to the caller.
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import os
 import shutil
 import subprocess
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Sequence, Tuple
+
+try:
+    import pdftotext as pdftotext_lib  # type: ignore
+except Exception:
+    pdftotext_lib = None  # type: ignore
 
 try:
     from pdf2image import convert_from_path  # type: ignore
@@ -39,10 +51,49 @@ try:
 except Exception:
     Image = None  # type: ignore
 
+# Default number of threads used to rasterise and OCR the pages of a
+# single PDF.  Tesseract runs as a subprocess, so threads are enough to
+# keep every core busy.  Callers that already run several extractions in
+# parallel pass a smaller budget to extract_text_from_pdf.
+OCR_THREADS = os.cpu_count() or 1
+
+# Seconds any one pdftotext, pdftoppm or tesseract run may take before it
+# is killed, so a pathological file cannot tie up a worker indefinitely
+SUBPROCESS_TIMEOUT = 120
+
+# pdftotext is looked up on PATH once, at import, rather than for every PDF
+_PDFTOTEXT_PATH = shutil.which("pdftotext")
+_PDFTOTEXT_ARGS: Tuple[str, ...] = (
+    (_PDFTOTEXT_PATH, "-layout", "-enc", "UTF-8", "-nopgbrk") if _PDFTOTEXT_PATH else ()
+)
+
+
+def _extract_text_pdftotext_lib(pdf_path: str) -> str:
+    """Use the ``pdftotext`` Python bindings to extract text in‑process.
+
+    Pages are laid out and joined as by the ``pdftotext -layout
+    -nopgbrk`` command.  Returns an empty string if the bindings are not
+    installed or fail on the file.
+    """
+    if pdftotext_lib is None:
+        return ""
+    try:
+        with open(pdf_path, "rb") as f:
+            try:
+                pdf = pdftotext_lib.PDF(f, physical=True)
+            except TypeError:
+                # Releases before 2.2 have no layout option
+                pdf = pdftotext_lib.PDF(f)
+        return "".join(pdf)
+    except Exception as exc:
+        logging.warning("pdftotext bindings failed on %s: %s", pdf_path, exc)
+        return ""
+
 
 def _extract_text_pdftotext(pdf_path: str) -> str:
     """Use the ``pdftotext`` CLI tool to extract text from a PDF file.
 
+    The in‑process bindings are tried first when they are installed.
     If ``pdftotext`` is not found on the system path or an error occurs
     while running it, an empty string is returned.
 
@@ -53,15 +104,18 @@ def _extract_text_pdftotext(pdf_path: str) -> str:
         The extracted text as a single string, or an empty string if the
         command fails.
     """
-    pdftotext_path = shutil.which("pdftotext")
-    if not pdftotext_path:
+    text = _extract_text_pdftotext_lib(pdf_path)
+    if text:
+        return text
+    if not _PDFTOTEXT_PATH:
         return ""
     try:
         result = subprocess.run(
-            [pdftotext_path, "-layout", "-enc", "UTF-8", "-nopgbrk", pdf_path, "-"],
+            [*_PDFTOTEXT_ARGS, pdf_path, "-"],
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
+            timeout=SUBPROCESS_TIMEOUT,
         )
         return result.stdout.decode("utf-8", errors="ignore")
     except Exception as exc:
@@ -77,13 +131,13 @@ def _extract_text_pytesseract_image(image) -> str:
     if pytesseract is None:
         return ""
     try:
-        return pytesseract.image_to_string(image)
+        return pytesseract.image_to_string(image, timeout=SUBPROCESS_TIMEOUT)
     except Exception as exc:
         logging.warning("pytesseract failed on image: %s", exc)
         return ""
 
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+def extract_text_from_pdf(pdf_path: str, threads: int = OCR_THREADS) -> str:
     """Extract text from a PDF by using the best available method.
 
     The extraction strategy is as follows:
@@ -93,17 +147,22 @@ def extract_text_from_pdf(pdf_path: str) -> str:
        extracted text is returned.
     2. If ``pdftotext`` is unavailable or fails and both ``pdf2image`` and
        ``pytesseract`` are available, convert each page of the PDF into
-       an image and run Tesseract OCR on it.  The resulting strings from
-       all pages are concatenated.
+       an image and run Tesseract OCR on it, several pages at a time.
+       The resulting strings from all pages are concatenated in page
+       order.
     3. If none of the above methods are available, return an empty string.
 
     Args:
         pdf_path: Path to the PDF file to process.
+        threads: Number of pages rasterised and OCRed at once.  Pass 1
+            when the call already runs in one of several parallel worker
+            processes, so the workers do not oversubscribe the CPUs.
 
     Returns:
         A string containing the extracted text.  If extraction fails,
         returns an empty string.
     """
+    threads = max(1, threads)
     # First try pdftotext
     text = _extract_text_pdftotext(pdf_path)
     if text:
@@ -117,14 +176,16 @@ def extract_text_from_pdf(pdf_path: str) -> str:
         )
         return ""
     try:
-        pages = convert_from_path(pdf_path)
+        pages = convert_from_path(pdf_path, thread_count=threads, timeout=SUBPROCESS_TIMEOUT)
     except Exception as exc:
         logging.error("Failed to convert PDF to images for OCR (%s): %s", pdf_path, exc)
         return ""
-    extracted_pages: List[str] = []
-    for idx, page in enumerate(pages, start=1):
-        logging.info("OCR processing page %s of %s in %s", idx, len(pages), pdf_path)
-        extracted_pages.append(_extract_text_pytesseract_image(page))
+    logging.info("OCR processing %s pages in %s", len(pages), pdf_path)
+    if threads == 1 or len(pages) <= 1:
+        extracted_pages: List[str] = [_extract_text_pytesseract_image(page) for page in pages]
+    else:
+        with ThreadPoolExecutor(max_workers=min(threads, len(pages))) as pool:
+            extracted_pages = list(pool.map(_extract_text_pytesseract_image, pages))
     return "\n".join(extracted_pages)
 
 
@@ -152,7 +213,7 @@ def extract_text_from_image(image_path: str) -> str:
         return ""
 
 
-def extract_text(file_path: str) -> str:
+def extract_text(file_path: str, threads: int = OCR_THREADS) -> str:
     """Dispatch extraction based on file extension.
 
     Args:
@@ -161,6 +222,8 @@ def extract_text(file_path: str) -> str:
             formats (PNG, JPEG) are forwarded to
             :func:`extract_text_from_image`.  Unknown formats result in an
             empty string.
+        threads: Page‑level parallelism for PDFs; see
+            :func:`extract_text_from_pdf`.
 
     Returns:
         Extracted text as a string, or an empty string if extraction is
@@ -168,9 +231,59 @@ def extract_text(file_path: str) -> str:
     """
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, threads)
     elif ext in {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff"}:
         return extract_text_from_image(file_path)
     else:
         logging.warning("Unsupported file format for OCR: %s", file_path)
-        return ""
\ No newline at end of file
+        return ""
+
+
+def text_is_current(pdf_path: str, txt_path: str) -> bool:
+    """Return True if ``txt_path`` holds text extracted from the current ``pdf_path``.
+
+    The text is current when it is non‑empty and no older than the PDF,
+    so a PDF replaced by a newer download is extracted again.
+    """
+    try:
+        txt = os.stat(txt_path)
+        return txt.st_size > 0 and txt.st_mtime >= os.stat(pdf_path).st_mtime
+    except OSError:
+        return False
+
+
+def extract_pdfs_to_files(jobs: Sequence[Tuple[str, str]], workers: int | None = None) -> None:
+    """Extract text from many PDFs in parallel and write it to text files.
+
+    Each PDF is converted in a separate worker process, so several
+    ``pdftotext`` or Tesseract runs proceed at once.  Results are written
+    by the calling process as soon as each one is ready.
+
+    Args:
+        jobs: ``(pdf_path, txt_path)`` pairs.  The text extracted from
+            ``pdf_path`` is written to ``txt_path``; missing parent
+            directories are created.
+        workers: Number of worker processes.  Defaults to the number of
+            CPUs.
+    """
+    if not jobs:
+        return
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    # "spawn" keeps workers safe to start from a threaded caller such as the web UI
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            # The workers already fill the CPUs, so each one OCRs its
+            # pages one at a time
+            futures = {pool.submit(extract_text_from_pdf, pdf, 1): (pdf, txt) for pdf, txt in jobs}
+            for future in as_completed(futures):
+                pdf_path, txt_path = futures[future]
+                try:
+                    text = future.result()
+                    os.makedirs(os.path.dirname(txt_path), exist_ok=True)
+                    with open(txt_path, "w", encoding="utf-8") as f:
+                        f.write(text)
+                except Exception as exc:
+                    logging.error("Failed to extract text from %s: %s", pdf_path, exc)
+    except Exception as exc:
+        logging.error("PDF extraction pool failed: %s", exc)
@@ -9,8 +9,9 @@ optionally extract text from downloaded PDFs.
 
 The scraper is conservative by design: it only follows links that
 belong to the same domain as the starting URL and avoids infinite
-loops by tracking visited URLs.  A configurable delay between
-requests is provided to reduce load on the remote server.
+loops by tracking visited URLs.  Pages are fetched by a small pool of
+worker threads, and a configurable delay between requests (shared by
+all workers) is provided to reduce load on the remote server.
 
 In addition to the crawl functionality, the scraper stores metadata
 about the last run so that it can decide whether a new scrape is
@@ -23,15 +24,32 @@ import logging
 import os
 import re
 import time
-from collections import deque
 from dataclasses import dataclass, field
-from typing import Set
-from urllib.parse import urljoin, urlparse
+from functools import partial
+from typing import List, Set
+from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
 
-from ocr_utils import extract_text_from_pdf
+from crawl_utils import (
+    DEFAULT_WORKERS,
+    BackgroundWriter,
+    RateLimiter,
+    UrlIndex,
+    crawl,
+    extract_hrefs,
+    finish_crawl,
+    iter_files,
+    make_session,
+    parse_url,
+    remote_size_matches,
+    save_streamed,
+    start_crawl,
+)
+from ocr_utils import extract_pdfs_to_files, text_is_current
+
+# Characters that are not safe in local file names
+_FNAME_SANITIZE = re.compile(r"[<>:/\\|?*]")
 
 
 @dataclass
@@ -41,7 +59,12 @@ class WorkAndIncomeScraper:
     start_url: str = "https://www.workandincome.govt.nz/map/index.html"
     output_dir: str = "data"
     delay: float = 0.3
+    workers: int = DEFAULT_WORKERS
     _visited: Set[str] = field(default_factory=set, init=False, repr=False)
+    # URLs fetched at or after this time are not requested again (see scrape)
+    _resume_since: float = field(default=float("inf"), init=False, repr=False)
+    # Pooled HTTP session reused by every crawl, so connections are kept alive
+    _session: requests.Session | None = field(default=None, init=False, repr=False)
     last_scrape_file: str = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
@@ -53,114 +76,197 @@ class WorkAndIncomeScraper:
         os.makedirs(self.pdf_dir, exist_ok=True)
         os.makedirs(self.text_dir, exist_ok=True)
         self.last_scrape_file = os.path.join(self.output_dir, "last_scrape.txt")
+        self.crawl_marker_file = os.path.join(self.output_dir, "crawl_in_progress.txt")
+        self.index_file = os.path.join(self.output_dir, "visited.sqlite")
 
     def scrape(self) -> None:
-        """Perform a depth‑first crawl of the website and download HTML and PDFs.
+        """Crawl the website and download HTML and PDFs.
 
-        All downloaded content is stored under the ``output_dir`` in
-        subdirectories: HTML pages in ``html/`` and PDFs in ``pdfs/``.
+        Pages are fetched concurrently by up to ``workers`` threads, while
+        the combined request rate is limited to one every ``delay``
+        seconds.  If the previous crawl was interrupted, URLs it already
+        fetched are not requested again; otherwise every URL is requested,
+        conditionally where validators are known.  All downloaded content
+        is stored under the ``output_dir`` in subdirectories: HTML pages
+        in ``html/`` and PDFs in ``pdfs/``.
 
         After crawling, ``extract_all_pdfs`` should be called to convert
         downloaded PDFs into text files in ``pdf_text/``.
         """
-        parsed_start = urlparse(self.start_url)
+        parsed_start = parse_url(self.start_url)
         base_domain = parsed_start.netloc
-        queue: deque[str] = deque([self.start_url])
-        session = requests.Session()
+        if self._session is None:
+            self._session = make_session(self.workers)
+        session = self._session
+        limiter = RateLimiter(self.delay)
+        index = UrlIndex(self.index_file)
+        writer = BackgroundWriter()
+        # The visited set only de-duplicates within a run; the index
+        # remembers what earlier runs fetched
+        self._visited.clear()
+        self._resume_since = start_crawl(self.crawl_marker_file)
 
         logging.info("Starting crawl from %s", self.start_url)
 
-        while queue:
-            current_url = queue.popleft()
-            if current_url in self._visited:
-                continue
-            self._visited.add(current_url)
-            try:
-                response = session.get(current_url, timeout=30)
-            except Exception as exc:
-                logging.warning("Failed to fetch %s: %s", current_url, exc)
-                continue
-            if response.status_code != 200:
-                logging.warning(
-                    "Non‑200 status for %s: %s", current_url, response.status_code
-                )
-                continue
-            content_type = response.headers.get("Content-Type", "").lower()
-            # If PDF, save and skip further processing
-            if "application/pdf" in content_type or current_url.lower().endswith(".pdf"):
-                filename = re.sub(r"[<>:/\\|?*]", "_", os.path.basename(urlparse(current_url).path))
-                if not filename.lower().endswith(".pdf"):
-                    filename += ".pdf"
-                pdf_path = os.path.join(self.pdf_dir, filename)
-                # Avoid overwriting if file already exists
-                if not os.path.exists(pdf_path):
-                    with open(pdf_path, "wb") as f:
-                        f.write(response.content)
-                    logging.info("Downloaded PDF: %s", pdf_path)
-                time.sleep(self.delay)
-                continue
-            # Otherwise assume HTML/text
-            html_text = response.text
-            # Determine relative path for saving
-            parsed_url = urlparse(current_url)
-            rel_path = parsed_url.path.lstrip("/")
-            if not rel_path or rel_path.endswith("/"):
-                rel_path = rel_path + "index.html"
-            local_path = os.path.join(self.html_dir, rel_path)
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            with open(local_path, "w", encoding="utf-8") as f:
-                f.write(html_text)
-            logging.info("Saved page: %s", local_path)
-            # Parse links from the HTML and enqueue new URLs
-            soup = BeautifulSoup(html_text, "html.parser")
-            for a_tag in soup.find_all("a", href=True):
-                href = a_tag["href"]
-                next_url = urljoin(current_url, href)
-                parsed_next = urlparse(next_url)
-                # Skip non-HTTP(S) schemes and external domains
-                if parsed_next.scheme not in {"http", "https"}:
-                    continue
-                if parsed_next.netloc != base_domain:
-                    continue
-                # Normalise by removing fragment
-                normalised = parsed_next._replace(fragment="").geturl()
-                if normalised not in self._visited:
-                    queue.append(normalised)
-            time.sleep(self.delay)
+        try:
+            crawl(
+                self.start_url,
+                partial(self._process_url, session, limiter, index, writer, base_domain),
+                workers=self.workers,
+                visited=self._visited,
+            )
+        finally:
+            # Pending writes still record their pages in the index
+            writer.close()
+            index.close()
+        finish_crawl(self.crawl_marker_file)
         # Update last scrape time
         with open(self.last_scrape_file, "w") as f:
             f.write(str(int(time.time())))
         logging.info("Crawl complete.  HTML saved under %s, PDFs under %s", self.html_dir, self.pdf_dir)
 
+    def _process_url(
+        self,
+        session: requests.Session,
+        limiter: RateLimiter,
+        index: UrlIndex,
+        writer: BackgroundWriter,
+        base_domain: str,
+        current_url: str,
+    ) -> List[str]:
+        """Download a single URL and return the same‑domain links it contains.
+
+        Runs on a crawler worker thread.  PDFs are saved under ``pdfs/``
+        and HTML pages under ``html/``; only HTML pages yield links.  If
+        the page was fetched recently or the server reports it unchanged,
+        links are read from the saved copy instead.  PDFs are streamed to
+        disk, and a ``.pdf`` URL whose local copy already has the remote
+        size is not downloaded again.  HTML pages are written by
+        ``writer`` while their links are extracted.
+        """
+        entry = index.get(current_url)
+        if UrlIndex.fetched_since(entry, self._resume_since):
+            return self._links_from_saved(current_url, entry.path, base_domain)
+        if current_url.lower().endswith(".pdf"):
+            pdf_path = self._pdf_path(current_url)
+            if os.path.exists(pdf_path):
+                limiter.wait()
+                if remote_size_matches(session, current_url, pdf_path):
+                    logging.debug("PDF unchanged: %s", pdf_path)
+                    return []
+        limiter.wait()
+        try:
+            response = session.get(
+                current_url,
+                headers=UrlIndex.request_headers(entry),
+                stream=True,
+                timeout=30,
+            )
+        except Exception as exc:
+            logging.warning("Failed to fetch %s: %s", current_url, exc)
+            return []
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            index.touch(current_url)
+            return self._links_from_saved(current_url, entry.path, base_domain)
+        if response.status_code != 200:
+            logging.warning(
+                "Non‑200 status for %s: %s", current_url, response.status_code
+            )
+            response.close()
+            return []
+        content_type = response.headers.get("Content-Type", "").lower()
+        # If PDF, save and skip further processing
+        if "application/pdf" in content_type or current_url.lower().endswith(".pdf"):
+            pdf_path = self._pdf_path(current_url)
+            try:
+                digest = save_streamed(response, pdf_path)
+            except (requests.RequestException, OSError) as exc:
+                logging.warning("Failed to download %s: %s", current_url, exc)
+                return []
+            finally:
+                response.close()
+            logging.info("Downloaded PDF: %s", pdf_path)
+            index.record(current_url, response, pdf_path, digest)
+            return []
+        # Otherwise assume HTML/text
+        html_text = response.text
+        # Determine relative path for saving
+        parsed_url = parse_url(current_url)
+        rel_path = parsed_url.path.lstrip("/")
+        if not rel_path or rel_path.endswith("/"):
+            rel_path = rel_path + "index.html"
+        local_path = os.path.join(self.html_dir, rel_path)
+        writer.write_text(
+            local_path,
+            html_text,
+            entry.sha256 if entry else "",
+            partial(index.record, current_url, response, local_path),
+        )
+        logging.info("Saving page: %s", local_path)
+        return self._extract_links(current_url, html_text, base_domain)
+
+    def _pdf_path(self, url: str) -> str:
+        """Return the local path a PDF downloaded from ``url`` is saved to."""
+        filename = _FNAME_SANITIZE.sub("_", os.path.basename(parse_url(url).path))
+        if not filename.lower().endswith(".pdf"):
+            filename += ".pdf"
+        return os.path.join(self.pdf_dir, filename)
+
+    def _links_from_saved(self, current_url: str, local_path: str, base_domain: str) -> List[str]:
+        """Return the links of an unchanged page from its saved copy."""
+        if local_path.lower().endswith(".pdf"):
+            return []
+        try:
+            with open(local_path, "r", encoding="utf-8", errors="ignore") as f:
+                html_text = f.read()
+        except OSError as exc:
+            logging.warning("Cannot read saved copy of %s: %s", current_url, exc)
+            return []
+        return self._extract_links(current_url, html_text, base_domain)
+
+    def _extract_links(self, current_url: str, html_text: str, base_domain: str) -> List[str]:
+        """Return same‑domain HTTP(S) links in ``html_text``, without fragments."""
+        links: List[str] = []
+        for href in extract_hrefs(html_text):
+            # Drop the fragment up front so the parse cache sees one key per page
+            next_url = urljoin(current_url, href).split("#", 1)[0]
+            parsed_next = parse_url(next_url)
+            # Skip non-HTTP(S) schemes and external domains
+            if parsed_next.scheme not in {"http", "https"}:
+                continue
+            if parsed_next.netloc != base_domain:
+                continue
+            links.append(next_url)
+        return links
+
     def extract_all_pdfs(self) -> None:
         """Iterate over all downloaded PDFs and extract their text.
 
         Extracted text is stored in files with the same relative path
-        structure under ``pdf_text/``.
+        structure under ``pdf_text/``.  PDFs are converted in parallel
+        worker processes.
         """
         logging.info("Extracting text from downloaded PDFs...")
-        for root, _, files in os.walk(self.pdf_dir):
-            for name in files:
-                if not name.lower().endswith(".pdf"):
-                    continue
-                pdf_path = os.path.join(root, name)
-                rel_path = os.path.relpath(pdf_path, self.pdf_dir)
-                txt_rel = os.path.splitext(rel_path)[0] + ".txt"
-                txt_full = os.path.join(self.text_dir, txt_rel)
-                os.makedirs(os.path.dirname(txt_full), exist_ok=True)
-                # Skip extraction if the text file already exists and is non-empty
-                if os.path.exists(txt_full):
-                    try:
-                        if os.path.getsize(txt_full) > 0:
-                            continue
-                    except OSError:
-                        pass
-                logging.info("Extracting %s", pdf_path)
-                text = extract_text_from_pdf(pdf_path)
-                with open(txt_full, "w", encoding="utf-8") as f:
-                    f.write(text)
+        jobs = []
+        for rel_path in iter_files(self.pdf_dir, ".pdf"):
+            pdf_path = os.path.join(self.pdf_dir, rel_path)
+            txt_full = os.path.join(self.text_dir, os.path.splitext(rel_path)[0] + ".txt")
+            # Skip extraction if the text was already extracted from this version of the PDF
+            if not text_is_current(pdf_path, txt_full):
+                jobs.append((pdf_path, txt_full))
+        logging.info("Extracting %d PDFs", len(jobs))
+        extract_pdfs_to_files(jobs)
         logging.info("PDF text extraction complete.  Results stored under %s", self.text_dir)
 
+    def last_scrape_time(self) -> int | None:
+        """Return the Unix time of the last completed scrape, or None if unknown."""
+        try:
+            with open(self.last_scrape_file, "r") as f:
+                return int(f.read().strip())
+        except Exception:
+            return None
+
     def needs_update(self, days: int = 30) -> bool:
         """Return True if the data should be refreshed based on age.
 
@@ -171,11 +277,8 @@ class WorkAndIncomeScraper:
             True if the last scrape is older than ``days``, or if no previous
             scrape timestamp exists.  False otherwise.
         """
-        try:
-            with open(self.last_scrape_file, "r") as f:
-                last_ts_str = f.read().strip()
-                last_ts = int(last_ts_str)
-        except Exception:
+        last_ts = self.last_scrape_time()
+        if last_ts is None:
             return True
         age_seconds = time.time() - last_ts
         return age_seconds > days * 24 * 3600